@@ -1,8 +1,11 @@
 import pandas as pd
+import pyarrow as pa
 import re
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
 import openai
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
 import time
 import logging
 import os
@@ -23,10 +26,12 @@ class TelegramDataTransformer:
         """
         self.csv_file_path = csv_file_path
         self.openai_client = None
+        self.async_openai_client = None
         
-        # Initialize OpenAI client if API key is provided
+        # Initialize OpenAI clients if API key is provided
         if openai_api_key:
             self.openai_client = OpenAI(api_key=openai_api_key)
+            self.async_openai_client = AsyncOpenAI(api_key=openai_api_key)
         
         # Define topic mappings based on Pre-data notes.txt
         self.topic_mappings = {
@@ -41,6 +46,23 @@ class TelegramDataTransformer:
         # Post-text pattern to remove
         self.post_text_pattern = r'#[A-Z]\d{8}\s*\|\s*SMU Confess Channel.*$'
         
+        # Precompiled regexes used for every row
+        self.topic_regex = re.compile(r'^(#\w+[^\s]*)')
+        # Leading topic and trailing post-text are removed in a single pass;
+        # \A keeps the topic branch anchored to the start of the whole text
+        self.clean_regex = re.compile(r'\A#\w+[^\s]*\s*|' + self.post_text_pattern, re.MULTILINE)
+        self.sentence_split_regex = re.compile(r'[.!?]+')
+    
+    def __getstate__(self) -> dict:
+        """
+        Drop the OpenAI clients when pickling for worker processes, which only
+        need the topic mappings and regexes
+        """
+        state = self.__dict__.copy()
+        state['openai_client'] = None
+        state['async_openai_client'] = None
+        return state
+        
     def extract_topic_and_clean_text(self, text: str) -> Tuple[str, str]:
         """
         Extract topic from text and clean the main content
@@ -52,7 +74,7 @@ class TelegramDataTransformer:
             Tuple[str, str]: (topic, cleaned_text)
         """
         # Extract topic (hashtag at the beginning)
-        topic_match = re.match(r'^(#\w+[^\s]*)', text)
+        topic_match = self.topic_regex.match(text)
         topic = 'unknown'
         
         if topic_match:
@@ -60,17 +82,27 @@ class TelegramDataTransformer:
             # Map to predefined topics or use the tag itself
             topic = self.topic_mappings.get(topic_tag, topic_tag.replace('#', ''))
         
-        # Remove topic from the beginning
-        cleaned_text = re.sub(r'^#\w+[^\s]*\s*', '', text)
-        
-        # Remove post-text from the end
-        cleaned_text = re.sub(self.post_text_pattern, '', cleaned_text, flags=re.MULTILINE)
-        
-        # Clean up extra whitespace
-        cleaned_text = cleaned_text.strip()
+        # Remove topic from the beginning and post-text from the end,
+        # then clean up extra whitespace
+        cleaned_text = self.clean_regex.sub('', text).strip()
         
         return topic, cleaned_text
     
+    def build_summary_messages(self, text: str) -> List[dict]:
+        """
+        Build the chat messages used to request a summary
+        
+        Args:
+            text (str): Text to summarize
+            
+        Returns:
+            List[dict]: Messages for the chat completions API
+        """
+        return [
+            {"role": "system", "content": "You are a helpful assistant that creates concise summaries of social media posts. Keep summaries to 1-2 sentences and focus on the main point or sentiment."},
+            {"role": "user", "content": f"Please provide a brief summary of this confession post: {text}"}
+        ]
+    
     def generate_summary_openai(self, text: str, max_retries: int = 3) -> str:
         """
         Generate AI summary using OpenAI API
@@ -89,10 +121,7 @@ class TelegramDataTransformer:
             try:
                 response = self.openai_client.chat.completions.create(
                     model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are a helpful assistant that creates concise summaries of social media posts. Keep summaries to 1-2 sentences and focus on the main point or sentiment."},
-                        {"role": "user", "content": f"Please provide a brief summary of this confession post: {text}"}
-                    ],
+                    messages=self.build_summary_messages(text),
                     max_tokens=100,
                     temperature=0.7
                 )
@@ -106,6 +135,56 @@ class TelegramDataTransformer:
                     logger.error(f"Failed to generate summary after {max_retries} attempts")
                     return f"Summary generation failed: {str(e)}"
     
+    async def generate_summary_openai_async(self, text: str, semaphore: asyncio.Semaphore, max_retries: int = 3) -> str:
+        """
+        Generate AI summary using the async OpenAI client
+        
+        Args:
+            text (str): Text to summarize
+            semaphore (asyncio.Semaphore): Limits the number of in-flight requests
+            max_retries (int): Maximum number of retry attempts
+            
+        Returns:
+            str: Generated summary
+        """
+        if not self.async_openai_client:
+            return "AI summary unavailable - no API key provided"
+        
+        for attempt in range(max_retries):
+            try:
+                async with semaphore:
+                    response = await self.async_openai_client.chat.completions.create(
+                        model="gpt-3.5-turbo",
+                        messages=self.build_summary_messages(text),
+                        max_tokens=100,
+                        temperature=0.7
+                    )
+                return response.choices[0].message.content.strip()
+                
+            except Exception as e:
+                logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                else:
+                    logger.error(f"Failed to generate summary after {max_retries} attempts")
+                    return f"Summary generation failed: {str(e)}"
+    
+    async def summarize_batch_openai(self, texts: List[str], concurrency: int = 16) -> List[str]:
+        """
+        Generate AI summaries for many texts with concurrent requests
+        
+        Args:
+            texts (List[str]): Texts to summarize
+            concurrency (int): Maximum number of concurrent API requests
+            
+        Returns:
+            List[str]: Generated summaries, in the same order as texts
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(
+            *(self.generate_summary_openai_async(text, semaphore) for text in texts)
+        )
+    
     def generate_summary_simple(self, text: str) -> str:
         """
         Generate a simple rule-based summary (fallback when no AI available)
@@ -117,7 +196,7 @@ class TelegramDataTransformer:
             str: Generated summary
         """
         # Simple extractive summary - take first sentence or first 100 characters
-        sentences = re.split(r'[.!?]+', text)
+        sentences = self.sentence_split_regex.split(text)
         if sentences and len(sentences[0].strip()) > 10:
             first_sentence = sentences[0].strip()
             if len(first_sentence) > 100:
@@ -127,6 +206,32 @@ class TelegramDataTransformer:
             # Fallback to first 100 characters
             return text[:97] + "..." if len(text) > 100 else text
     
+    def process_texts(self, texts: pd.Series, simple_summary: bool = True) -> pd.DataFrame:
+        """
+        Extract topics, clean text and optionally summarize a series of texts
+        
+        Args:
+            texts (pd.Series): Original texts from CSV
+            simple_summary (bool): Whether to add rule-based summaries
+            
+        Returns:
+            pd.DataFrame: 'topic', 'text' and (optionally) 'summary' columns, indexed like texts
+        """
+        topic_tags = texts.str.extract(self.topic_regex, expand=False)
+        result = pd.DataFrame(index=texts.index)
+        result['topic'] = (
+            topic_tags.map(self.topic_mappings)
+            .fillna(topic_tags.str.replace('#', '', regex=False))
+            .fillna('unknown')
+        )
+        result['text'] = (
+            texts.str.replace(self.clean_regex, '', regex=True)
+            .str.strip()
+        )
+        if simple_summary:
+            result['summary'] = result['text'].map(self.generate_summary_simple)
+        return result
+    
     def handle_existing_output_file(self, output_file: str) -> str:
         """
         Handle existing output file by creating backup or asking user preference
@@ -157,18 +262,39 @@ class TelegramDataTransformer:
             new_output_file = f"{base_name}_{timestamp}{ext}"
             logger.info(f"Could not backup existing file. Using new filename: {new_output_file}")
             return new_output_file
+    
+    def save_dataframe(self, df: pd.DataFrame, output_file: str, output_format: str = 'csv') -> None:
+        """
+        Save the transformed dataframe in the requested format
+        
+        Args:
+            df (pd.DataFrame): Dataframe to save
+            output_file (str): Path to the output file
+            output_format (str): 'csv' or 'parquet' (snappy-compressed)
+        """
+        if output_format == 'parquet':
+            df.to_parquet(output_file, engine='pyarrow', compression='snappy', index=False)
+        else:
+            df.to_csv(output_file, index=False, chunksize=10000)
 
-    def transform_data(self, use_ai_summary: bool = True, output_file: Optional[str] = None) -> pd.DataFrame:
+    def transform_data(self, use_ai_summary: bool = True, output_file: Optional[str] = None,
+                       concurrency: int = 16, n_jobs: int = 1, output_format: str = 'csv') -> pd.DataFrame:
         """
         Transform the CSV data according to requirements
         
         Args:
             use_ai_summary (bool): Whether to use AI for summary generation
             output_file (str, optional): Path to save the transformed data
+            concurrency (int): Maximum number of concurrent AI summary requests
+            n_jobs (int): Number of worker processes for text cleaning (-1 uses all CPU cores)
+            output_format (str): Output file format, 'csv' or 'parquet'
             
         Returns:
             pd.DataFrame: Transformed dataframe
         """
+        if output_format not in ('csv', 'parquet'):
+            raise ValueError(f"Unsupported output format: {output_format}")
+        
         logger.info(f"Loading data from {self.csv_file_path}")
         
         # Check if input file exists
@@ -177,41 +303,57 @@ class TelegramDataTransformer:
         
         # Load the CSV file
         try:
-            df = pd.read_csv(self.csv_file_path)
+            # Only the output columns are read, into Arrow-backed dtypes.
+            # timestamp and text are typed as strings at parse time so the
+            # timestamp is passed through as-is and an all-empty text column
+            # is still a string column
+            df = pd.read_csv(
+                self.csv_file_path,
+                usecols=['post_id', 'timestamp', 'text'],
+                dtype={
+                    'timestamp': pd.ArrowDtype(pa.string()),
+                    'text': pd.ArrowDtype(pa.string())
+                },
+                dtype_backend='pyarrow'
+            )
             logger.info(f"Loaded {len(df)} rows")
         except Exception as e:
             logger.error(f"Error loading CSV file: {e}")
             raise
         
-        # Initialize new columns
-        df['topic'] = ''
-        df['summary'] = ''
-        df['cleaned_text'] = ''
-        
-        # Process each row
-        for index, row in df.iterrows():
-            if index % 100 == 0:
-                logger.info(f"Processing row {index + 1}/{len(df)}")
-            
-            text = str(row['text'])
-            
-            # Extract topic and clean text
-            topic, cleaned_text = self.extract_topic_and_clean_text(text)
-            
-            # Generate summary
-            if use_ai_summary and self.openai_client:
-                summary = self.generate_summary_openai(cleaned_text)
-            else:
-                summary = self.generate_summary_simple(cleaned_text)
-            
-            # Update dataframe
-            df.at[index, 'topic'] = topic
-            df.at[index, 'summary'] = summary
-            df.at[index, 'cleaned_text'] = cleaned_text
+        # Arrow-backed nulls survive astype(str), so fill missing text (e.g.
+        # media-only posts) with 'nan' as the original per-row str() did
+        df['text'] = df['text'].fillna('nan')
+        
+        # Extract topic, clean text and (without AI) summarize, split across
+        # worker processes if requested
+        texts = df['text'].astype(str)
+        use_ai = use_ai_summary and self.openai_client is not None
+        workers = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+        if workers > 1 and len(texts) > 0:
+            logger.info(f"Processing {len(df)} rows with {workers} worker processes")
+            chunk_size = -(-len(texts) // workers)
+            chunks = [texts.iloc[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                processed = pd.concat(
+                    executor.map(self.process_texts, chunks, [not use_ai] * len(chunks))
+                )
+        else:
+            logger.info(f"Processing {len(df)} rows")
+            processed = self.process_texts(texts, simple_summary=not use_ai)
         
         # Replace the original text column with cleaned text
-        df['text'] = df['cleaned_text']
-        df = df.drop('cleaned_text', axis=1)
+        df['topic'] = processed['topic']
+        df['text'] = processed['text']
+        
+        # Generate AI summaries concurrently
+        if use_ai:
+            logger.info(f"Generating AI summaries for {len(df)} rows")
+            df['summary'] = asyncio.run(
+                self.summarize_batch_openai(df['text'].tolist(), concurrency=concurrency)
+            )
+        else:
+            df['summary'] = processed['summary']
         
         # Reorder columns
         df = df[['post_id', 'timestamp', 'topic', 'summary', 'text']]
@@ -221,7 +363,7 @@ class TelegramDataTransformer:
             try:
                 # Handle existing output file
                 final_output_file = self.handle_existing_output_file(output_file)
-                df.to_csv(final_output_file, index=False)
+                self.save_dataframe(df, final_output_file, output_format)
                 logger.info(f"Transformed data saved to {final_output_file}")
             except Exception as e:
                 logger.error(f"Error saving output file: {e}")
@@ -230,7 +372,7 @@ class TelegramDataTransformer:
                 timestamp = datetime.now().strftime("%Y%m%d_%I%M%S%p")
                 fallback_file = f"{base_name}_emergency_{timestamp}{ext}"
                 try:
-                    df.to_csv(fallback_file, index=False)
+                    self.save_dataframe(df, fallback_file, output_format)
                     logger.info(f"Saved to fallback file: {fallback_file}")
                 except Exception as e2:
                     logger.error(f"Failed to save even to fallback file: {e2}")
@@ -0,0 +1,45 @@
+import importlib.util
+import os
+
+# "data transformer.py" has a space in its name, so load it from its path
+spec = importlib.util.spec_from_file_location(
+    "data_transformer", os.path.join(os.path.dirname(__file__), "data transformer.py")
+)
+data_transformer = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(data_transformer)
+
+
+def test_iso_timestamps_pass_through_unchanged(tmp_path):
+    csv_file = tmp_path / "posts.csv"
+    csv_file.write_text(
+        "post_id,timestamp,text\n"
+        "1,2025-06-17T15:21:00+00:00,#rant🤬 Exams are close. Send help\n"
+        "2,2025-06-18T09:00:00+00:00,#love❤️ Hello there\n",
+        encoding="utf-8",
+    )
+
+    df = data_transformer.TelegramDataTransformer(str(csv_file)).transform_data(use_ai_summary=False)
+
+    assert df["timestamp"].tolist() == ["2025-06-17T15:21:00+00:00", "2025-06-18T09:00:00+00:00"]
+    assert df["topic"].tolist() == ["rant", "love"]
+
+
+def test_all_empty_text_column(tmp_path):
+    csv_file = tmp_path / "posts.csv"
+    csv_file.write_text(
+        "post_id,timestamp,text\n"
+        "1,2025-06-17T15:21:00+00:00,\n"
+        "2,2025-06-18T09:00:00+00:00,\n",
+        encoding="utf-8",
+    )
+    output_file = tmp_path / "posts_transformed.csv"
+
+    data_transformer.TelegramDataTransformer(str(csv_file)).transform_data(
+        use_ai_summary=False, output_file=str(output_file)
+    )
+
+    assert output_file.read_text(encoding="utf-8").splitlines() == [
+        "post_id,timestamp,topic,summary,text",
+        "1,2025-06-17T15:21:00+00:00,unknown,nan,nan",
+        "2,2025-06-18T09:00:00+00:00,unknown,nan,nan",
+    ]
@@ -4,18 +4,39 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from wordcloud import WordCloud
-from collections import Counter
 import nltk
 from nltk.corpus import stopwords
 
+@st.cache_resource
+def load_stopwords():
+    nltk.download('stopwords', quiet=True)
+    return frozenset(stopwords.words('english'))
+
+stop_words = load_stopwords()
+
 # Load data
 @st.cache_data
 def load_data():
     # Load your cleaned Excel file
     sheets = pd.read_excel('sgsmu.studentcare_instagram_comments_cleaned.xlsx', sheet_name=None)
-    combined_df = pd.concat([df.assign(Post=sheet) for sheet, df in sheets.items()], ignore_index=True)
+    combined_df = pd.concat(sheets, names=['Post', None])
+    combined_df['Post'] = combined_df.index.get_level_values('Post').astype('category')
+    combined_df = combined_df.reset_index(drop=True)
+    combined_df['Sentiment'] = combined_df['Sentiment'].astype('category')
     return combined_df
 
+@st.cache_data(show_spinner=False)
+def compute_word_freq(df):
+    words = df.iloc[:, 3].dropna().astype(str).str.lower().str.findall(r'\b[a-z]{3,}\b').explode()
+    words = words[~words.isin(stop_words)]
+    return words.value_counts()
+
+@st.cache_data(show_spinner=False)
+def compute_wordcloud(df):
+    all_text = ' '.join(df.iloc[:, 3].dropna().astype(str))
+    wordcloud = WordCloud(width=800, height=400, background_color='white').generate(all_text)
+    return wordcloud.to_array()
+
 df = load_data()
 
 st.title('Student Mental Wellness Dashboard')
@@ -29,19 +50,16 @@ st.pyplot(fig)
 
 # Top Words
 st.header('Top Words')
-all_text = ' '.join(df.iloc[:, 3].dropna().astype(str))
-stop_words = set(stopwords.words('english'))
-words = [word.lower() for word in all_text.split() if word.lower() not in stop_words and len(word) > 2]
-word_freq = Counter(words)
-top_words = word_freq.most_common(20)
-words_df = pd.DataFrame(top_words, columns=['Word', 'Frequency'])
+word_freq = compute_word_freq(df)
+top_words = word_freq.head(20)
+words_df = pd.DataFrame({'Word': top_words.index, 'Frequency': top_words.values})
 fig, ax = plt.subplots(figsize=(10, 6))
 sns.barplot(x='Frequency', y='Word', data=words_df, ax=ax)
 st.pyplot(fig)
 
 # Word Cloud
 st.header('Word Cloud')
-wordcloud = WordCloud(width=800, height=400, background_color='white').generate(all_text)
+wordcloud = compute_wordcloud(df)
 fig, ax = plt.subplots(figsize=(10, 5))
 ax.imshow(wordcloud, interpolation='bilinear')
 ax.axis('off')
@@ -49,7 +67,7 @@ st.pyplot(fig)
 
 # Sentiment by Post
 st.header('Sentiment by Post')
-sentiment_by_post = df.groupby(['Post', 'Sentiment']).size().unstack(fill_value=0)
+sentiment_by_post = pd.crosstab(df['Post'], df['Sentiment'])
 fig, ax = plt.subplots(figsize=(12, 6))
 sentiment_by_post.plot(kind='bar', stacked=True, ax=ax)
 st.pyplot(fig)